@@ -139,6 +139,8 @@ export const patientsApi = {
   /**
    * Get vitals history for a patient
    * @param hours - Optional filter for last N hours (24, 48, 72, etc.)
+   * @param before - Cursor: recorded_at of the last item of the previous page
+   * @param before_id - Cursor tie-breaker: id of that same item (required with before)
    */
   async getVitalsHistory(
     patientId: string,
@@ -146,6 +148,8 @@ export const patientsApi = {
       hours?: number;
       limit?: number;
       offset?: number;
+      before?: string;
+      before_id?: string;
     },
   ): Promise<VitalsRecord[]> {
     const response = await apiClient.get<VitalsRecord[]>(
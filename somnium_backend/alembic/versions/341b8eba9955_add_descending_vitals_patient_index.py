@@ -0,0 +1,53 @@
+"""Add descending (patient_id, recorded_at) vitals index
+
+Revision ID: 341b8eba9955
+Revises: e65afc3eb5a4
+Create Date: 2026-01-08 11:02:17.903514
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "341b8eba9955"
+down_revision: Union[str, Sequence[str], None] = "e65afc3eb5a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_vitals_patient_recorded_desc",
+            "patient_vitals",
+            ["patient_id", sa.text("recorded_at DESC")],
+            postgresql_concurrently=True,
+        )
+        # Superseded by the descending index above
+        op.drop_index(
+            "ix_patient_vitals_patient_recorded",
+            table_name="patient_vitals",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_patient_vitals_patient_recorded",
+            "patient_vitals",
+            ["patient_id", "recorded_at"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_vitals_patient_recorded_desc",
+            table_name="patient_vitals",
+            postgresql_concurrently=True,
+        )
@@ -89,6 +89,12 @@ def upgrade() -> None:
     )
 
     # Create patient_vitals table
+    # CHECK constraints are created inline here because the table starts empty.
+    # Constraints added later to the populated table must be created with
+    # op.create_check_constraint(..., postgresql_not_valid=True) and validated
+    # in a separate migration with
+    # op.execute("ALTER TABLE patient_vitals VALIDATE CONSTRAINT <name>")
+    # so the ALTER does not hold an exclusive lock during a full table scan.
     op.create_table(
         "patient_vitals",
         sa.Column("id", sa.UUID(), nullable=False),
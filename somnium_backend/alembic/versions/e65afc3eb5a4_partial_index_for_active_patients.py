@@ -0,0 +1,63 @@
+"""Partial index for active patients
+
+Revision ID: e65afc3eb5a4
+Revises: c9bebfff3a8f
+Create Date: 2026-01-08 10:14:52.481203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e65afc3eb5a4"
+down_revision: Union[str, Sequence[str], None] = "c9bebfff3a8f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block. Build the new
+    # index under a temporary name first so queries keep an index while
+    # it builds, then swap it in under the old name.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_patients_hospital_active_new",
+            "patients",
+            ["hospital_id"],
+            postgresql_where=sa.text("is_active = true"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_patients_hospital_active",
+            table_name="patients",
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            "ALTER INDEX ix_patients_hospital_active_new "
+            "RENAME TO ix_patients_hospital_active"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_patients_hospital_active_old",
+            "patients",
+            ["hospital_id", "is_active"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_patients_hospital_active",
+            table_name="patients",
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            "ALTER INDEX ix_patients_hospital_active_old "
+            "RENAME TO ix_patients_hospital_active"
+        )
@@ -3,7 +3,84 @@ Server-Sent Events (SSE) manager for real-time patient data updates.
 """
 
 import asyncio
-from typing import Dict, Set
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Tuple, Union
+
+import orjson
+
+
+@lru_cache(maxsize=64)
+def _frame_prefix(event_type: str) -> bytes:
+    """Return the SSE frame prefix for an event type (cached per type)."""
+    return b"event: %s\ndata: " % event_type.encode()
+
+
+def _encode_frame(envelope: dict) -> bytes:
+    """
+    Encode an event envelope as a complete SSE frame.
+
+    orjson is a compiled encoder that handles datetimes and UUIDs natively,
+    so arbitrary vitals/alert payloads need no per-type schema.
+    """
+    return _frame_prefix(envelope["event"]) + orjson.dumps(envelope) + b"\n\n"
+
+
+class SSESink:
+    """
+    Event buffer for a single SSE connection.
+
+    Each sink has one producer (the event manager) and one consumer (the
+    HTTP response streaming to the client), so a deque plus an Event is
+    enough; asyncio.Queue's getter/putter futures are not needed.
+
+    Unlike asyncio.Queue, a consumer that polls an empty sink with a timeout
+    leaves nothing behind: a cancelled Event.wait() removes its own waiter.
+
+    By default a sink receives pre-framed SSE bytes that can be written to
+    the response as-is. A sink created with raw=True receives the event
+    envelope dict instead.
+    """
+
+    # No per-instance __dict__: one sink exists per open SSE connection
+    __slots__ = ("events", "ready", "raw")
+
+    # Events buffered per sink before the oldest are dropped
+    DEFAULT_MAXLEN = 256
+
+    def __init__(self, maxlen: int = DEFAULT_MAXLEN, raw: bool = False) -> None:
+        """Initialize an empty sink holding at most maxlen events."""
+        self.events: Deque[Union[bytes, dict]] = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+        self.raw = raw
+
+    def push(self, event: Union[bytes, dict]) -> None:
+        """
+        Buffer an event and wake the consumer.
+
+        When the sink is full the oldest event is dropped, so a slow client
+        falls behind instead of stalling the publisher.
+        """
+        self.events.append(event)
+        self.ready.set()
+
+    def push_many(self, events: List[Union[bytes, dict]]) -> None:
+        """Buffer several events in order and wake the consumer once."""
+        self.events.extend(events)
+        self.ready.set()
+
+    async def drain(self) -> List[Union[bytes, dict]]:
+        """
+        Wait for at least one event, then return everything buffered.
+
+        Returns:
+            List[Union[bytes, dict]]: Buffered events, oldest first
+        """
+        await self.ready.wait()
+        self.ready.clear()
+        events = list(self.events)
+        self.events.clear()
+        return events
 
 
 class SSEEventManager:
@@ -11,43 +88,46 @@ class SSEEventManager:
     Manages SSE subscriptions per patient for real-time updates.
 
     Uses in-memory pub/sub pattern where:
-    - Each patient has a set of subscriber queues
+    - Each patient has a set of subscriber sinks
     - Events published to a patient are broadcast to all subscribers
     - Supports multiple concurrent clients per patient
+    - A slow subscriber loses its oldest events instead of stalling others
+
+    No method awaits while touching the subscriber table, so under asyncio
+    each call runs atomically and no lock is needed.
     """
 
     def __init__(self) -> None:
         """Initialize the event manager with empty subscribers."""
-        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
-        self._lock = asyncio.Lock()
+        # Each patient maps to its sinks keyed by id(sink), so unsubscribe
+        # is O(1)
+        self._subscribers: Dict[str, Dict[int, SSESink]] = {}
 
-    async def subscribe(self, patient_id: str, queue: asyncio.Queue) -> None:
+    async def subscribe(self, patient_id: str, sink: SSESink) -> None:
         """
-        Subscribe a client queue to receive events for a patient.
+        Subscribe a client sink to receive events for a patient.
 
         Args:
             patient_id: UUID string of the patient
-            queue: Asyncio queue for sending events to the client
+            sink: SSESink for sending events to the client
         """
-        async with self._lock:
-            if patient_id not in self._subscribers:
-                self._subscribers[patient_id] = set()
-            self._subscribers[patient_id].add(queue)
+        self._subscribers.setdefault(patient_id, {})[id(sink)] = sink
 
-    async def unsubscribe(self, patient_id: str, queue: asyncio.Queue) -> None:
+    async def unsubscribe(self, patient_id: str, sink: SSESink) -> None:
         """
-        Unsubscribe a client queue from patient events.
+        Unsubscribe a client sink from patient events.
 
         Args:
             patient_id: UUID string of the patient
-            queue: Queue to remove from subscribers
+            sink: Sink to remove from subscribers
         """
-        async with self._lock:
-            if patient_id in self._subscribers:
-                self._subscribers[patient_id].discard(queue)
-                # Clean up empty subscriber sets
-                if not self._subscribers[patient_id]:
-                    del self._subscribers[patient_id]
+        sinks = self._subscribers.get(patient_id)
+        if sinks is None:
+            return
+        sinks.pop(id(sink), None)
+        if not sinks:
+            # Clean up empty subscriber dicts
+            del self._subscribers[patient_id]
 
     async def publish(self, patient_id: str, event_type: str, data: dict) -> None:
         """
@@ -58,29 +138,47 @@ class SSEEventManager:
             event_type: Type of event (e.g., 'vitals_update', 'alert', 'prediction')
             data: Event data dictionary
         """
-        async with self._lock:
-            if patient_id not in self._subscribers:
-                return
+        await self.publish_batch(patient_id, [(event_type, data)])
+
+    async def publish_batch(
+        self, patient_id: str, events: List[Tuple[str, dict]]
+    ) -> None:
+        """
+        Publish several events to all subscribers of a patient at once.
 
-            # Create SSE-formatted event
-            event = {
+        Each subscriber receives the whole batch in order and is woken once,
+        so e.g. a snapshot and its delta reach the client on the same tick.
+
+        Args:
+            patient_id: UUID string of the patient
+            events: (event_type, data) pairs, in delivery order
+        """
+        sinks = self._subscribers.get(patient_id)
+        if not sinks or not events:
+            return
+
+        # Create SSE-formatted events once; every sink receives these same
+        # objects, so consumers must treat them as read-only
+        envelopes = [
+            {
                 "event": event_type,
                 "data": data,
                 "patient_id": patient_id,
             }
+            for event_type, data in events
+        ]
 
-            # Send to all subscribers (non-blocking)
-            dead_queues = set()
-            for queue in self._subscribers[patient_id]:
-                try:
-                    queue.put_nowait(event)
-                except asyncio.QueueFull:
-                    # Mark queue for removal if full
-                    dead_queues.add(queue)
+        # Serialize at most once per publish, however many sinks are framed
+        frames = None
 
-            # Clean up dead queues
-            for queue in dead_queues:
-                self._subscribers[patient_id].discard(queue)
+        # Send to all subscribers (non-blocking, no suspension points)
+        for sink in sinks.values():
+            if sink.raw:
+                sink.push_many(envelopes)
+                continue
+            if frames is None:
+                frames = [_encode_frame(envelope) for envelope in envelopes]
+            sink.push_many(frames)
 
     def get_subscriber_count(self, patient_id: str) -> int:
         """
@@ -92,7 +190,7 @@ class SSEEventManager:
         Returns:
             int: Number of active subscribers
         """
-        return len(self._subscribers.get(patient_id, set()))
+        return len(self._subscribers.get(patient_id, {}))
 
     async def broadcast_all(self, event_type: str, data: dict) -> None:
         """
@@ -102,9 +200,8 @@ class SSEEventManager:
             event_type: Type of event
             data: Event data dictionary
         """
-        async with self._lock:
-            for patient_id in list(self._subscribers.keys()):
-                await self.publish(patient_id, event_type, data)
+        for patient_id in list(self._subscribers):
+            await self.publish(patient_id, event_type, data)
 
 
 # Global singleton instance
@@ -22,7 +22,9 @@ from app.core.config import settings
 
 
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address, storage_uri=settings.REDIS_URL or "memory://"
+)
 
 
 @router.post(
@@ -16,6 +16,7 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -187,7 +188,12 @@ class Patient(Base):
             name="ck_patient_sweep_gas_positive",
         ),
         Index("ix_patients_hospital_status", "hospital_id", "status"),
-        Index("ix_patients_hospital_active", "hospital_id", "is_active"),
+        # Partial index: only active patients are ever listed by hospital
+        Index(
+            "ix_patients_hospital_active",
+            "hospital_id",
+            postgresql_where=text("is_active = true"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -350,7 +356,12 @@ class PatientVitals(Base):
             "hco3 IS NULL OR hco3 >= 0",
             name="ck_vitals_hco3_positive",
         ),
-        Index("ix_patient_vitals_patient_recorded", "patient_id", "recorded_at"),
+        # Matches the ORDER BY recorded_at DESC LIMIT 1 latest-vitals lookups
+        Index(
+            "ix_vitals_patient_recorded_desc",
+            "patient_id",
+            text("recorded_at DESC"),
+        ),
         Index("ix_patient_vitals_recorded_at", "recorded_at"),
     )
 
@@ -1,9 +1,11 @@
 """Patient and Vitals API Router."""
 
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -23,6 +25,10 @@ from app.domain.patients.service import PatientService, VitalsService
 
 router = APIRouter(prefix="/api/v1/patients", tags=["patients"])
 
+# Large vitals payloads are serialized straight to JSON bytes by pydantic-core
+# instead of going through FastAPI's jsonable_encoder + json.dumps
+_vitals_list_adapter = TypeAdapter(list[VitalsResponse])
+
 
 # ============================================================================
 # Patient Endpoints
@@ -294,17 +300,42 @@ async def get_vitals_history(
     hours: Optional[int] = Query(None, ge=1, description="Filter last N hours"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    before: Optional[datetime] = Query(
+        None,
+        description="Cursor: only return vitals recorded before this time "
+        "(use the recorded_at of the last item of the previous page)",
+    ),
+    before_id: Optional[UUID] = Query(
+        None,
+        description="Cursor tie-breaker: the id of the last item of the "
+        "previous page (required with `before`)",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> list[VitalsResponse]:
+) -> Response:
     """
     Get vitals history for a patient with optional time filter.
+    Supports keyset pagination via the `before`/`before_id` cursor, which
+    must not be combined with `offset`.
     Requires nurse, physician, ecmo_specialist, or admin role.
     """
+    if (before is None) != (before_id is None) or (before and offset):
+        from fastapi import HTTPException
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`before` and `before_id` must be given together "
+            "and cannot be combined with `offset`",
+        )
+
     vitals_list = await VitalsService.get_vitals_history(
-        db, patient_id, hours, limit, offset
+        db, patient_id, hours, limit, offset, before, before_id
+    )
+    history = _vitals_list_adapter.validate_python(vitals_list, from_attributes=True)
+    return Response(
+        content=_vitals_list_adapter.dump_json(history),
+        media_type="application/json",
     )
-    return [VitalsResponse.model_validate(v) for v in vitals_list]
 
 
 @router.get(
@@ -319,11 +350,15 @@ async def get_vitals_trends(
     ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-) -> VitalsTrendsResponse:
+) -> Response:
     """
     Get vitals trends for graphing (PaO2, PaCO2, Lactate, pH, HCO3).
     Supports time filters: 24h, 48h, 72h, or all-time (no hours parameter).
     Requires nurse, physician, ecmo_specialist, or admin role.
     """
     trends = await VitalsService.get_vitals_trends(db, patient_id, hours)
-    return VitalsTrendsResponse(**trends)
+    # Trend points are already VitalTrend instances built by the service
+    return Response(
+        content=VitalsTrendsResponse.model_construct(**trends).model_dump_json(),
+        media_type="application/json",
+    )
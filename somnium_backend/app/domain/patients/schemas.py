@@ -1,7 +1,9 @@
 """Patient and Vitals Pydantic Schemas."""
 
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
@@ -9,6 +11,40 @@ from pydantic import BaseModel, Field, field_validator
 from app.domain.patients.models import ECMOMode, Gender, PatientStatus
 
 
+# ============================================================================
+# Validation Helpers
+# ============================================================================
+
+
+def _validate_not_future(v: Any, error_message: str) -> Any:
+    """
+    Ensure a datetime is not in the future and preserve local timezone.
+
+    Timezone-aware values are returned as naive datetimes carrying the
+    user's local wall-clock time (e.g., 00:17 stays as 00:17).
+    """
+    if v is None:
+        return v
+
+    # If it's a string (ISO 8601 from frontend), parse it
+    if isinstance(v, str):
+        # fromisoformat accepts a trailing "Z" since Python 3.11
+        v = datetime.fromisoformat(v)
+
+    if isinstance(v, datetime):
+        # POSIX timestamps compare aware (UTC) and naive (local) values
+        # against the wall clock without building a "now" datetime per call
+        if v.timestamp() > time.time():
+            raise ValueError(error_message)
+
+        if v.tzinfo is not None:
+            # Keep the local time components, drop the offset
+            return v.replace(tzinfo=None)
+        return v
+
+    return v
+
+
 # ============================================================================
 # Patient Schemas
 # ============================================================================
@@ -72,54 +108,7 @@ class PatientCreate(PatientBase):
         cls, v: str | datetime | None
     ) -> str | datetime | None:
         """Ensure dates are not in the future and preserve local timezone."""
-        from datetime import timezone
-
-        if v is None:
-            return v
-
-        # If it's a string (ISO 8601 from frontend), parse it
-        if isinstance(v, str):
-            dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
-
-            # Get current time in UTC for comparison
-            now_utc = datetime.now(timezone.utc)
-
-            # Check if it's in the future
-            if dt > now_utc:
-                raise ValueError("Date cannot be in the future")
-
-            # Extract local time components to preserve user's timezone
-            if dt.tzinfo is not None:
-                return datetime(
-                    dt.year,
-                    dt.month,
-                    dt.day,
-                    dt.hour,
-                    dt.minute,
-                    dt.second,
-                    dt.microsecond,
-                )
-            else:
-                return dt
-
-        # If it's already a datetime object
-        if isinstance(v, datetime):
-            now_utc = datetime.now(timezone.utc)
-
-            if v.tzinfo is not None:
-                if v > now_utc:
-                    raise ValueError("Date cannot be in the future")
-                # Extract local time components
-                return datetime(
-                    v.year, v.month, v.day, v.hour, v.minute, v.second, v.microsecond
-                )
-            else:
-                now_naive = datetime.now()
-                if v > now_naive:
-                    raise ValueError("Date cannot be in the future")
-                return v
-
-        return v
+        return _validate_not_future(v, "Date cannot be in the future")
 
     @field_validator("admission_date")
     @classmethod
@@ -168,54 +157,7 @@ class PatientUpdate(BaseModel):
         cls, v: str | datetime | None
     ) -> str | datetime | None:
         """Ensure dates are not in the future and preserve local timezone."""
-        from datetime import timezone
-
-        if v is None:
-            return v
-
-        # If it's a string (ISO 8601 from frontend), parse it
-        if isinstance(v, str):
-            dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
-
-            # Get current time in UTC for comparison
-            now_utc = datetime.now(timezone.utc)
-
-            # Check if it's in the future
-            if dt > now_utc:
-                raise ValueError("Date cannot be in the future")
-
-            # Extract local time components to preserve user's timezone
-            if dt.tzinfo is not None:
-                return datetime(
-                    dt.year,
-                    dt.month,
-                    dt.day,
-                    dt.hour,
-                    dt.minute,
-                    dt.second,
-                    dt.microsecond,
-                )
-            else:
-                return dt
-
-        # If it's already a datetime object
-        if isinstance(v, datetime):
-            now_utc = datetime.now(timezone.utc)
-
-            if v.tzinfo is not None:
-                if v > now_utc:
-                    raise ValueError("Date cannot be in the future")
-                # Extract local time components
-                return datetime(
-                    v.year, v.month, v.day, v.hour, v.minute, v.second, v.microsecond
-                )
-            else:
-                now_naive = datetime.now()
-                if v > now_naive:
-                    raise ValueError("Date cannot be in the future")
-                return v
-
-        return v
+        return _validate_not_future(v, "Date cannot be in the future")
 
 
 class PatientResponse(PatientBase):
@@ -230,6 +172,7 @@ class PatientResponse(PatientBase):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class PatientWithLatestVitals(PatientResponse):
@@ -238,9 +181,6 @@ class PatientWithLatestVitals(PatientResponse):
     latest_vitals: Optional["VitalsResponse"] = None
     vitals_count: int = 0
 
-    class Config:
-        from_attributes = True
-
 
 # ============================================================================
 # Patient Vitals Schemas
@@ -297,54 +237,7 @@ class VitalsCreate(VitalsBase):
     @classmethod
     def validate_recorded_at(cls, v) -> datetime:
         """Ensure recorded_at is not in the future and preserve local timezone."""
-        from datetime import timezone
-
-        # If it's a string (ISO 8601 from frontend), parse it ourselves
-        if isinstance(v, str):
-            # Parse the datetime string with the user's timezone
-            dt = datetime.fromisoformat(v.replace("Z", "+00:00"))
-
-            # Get current time in UTC for comparison
-            now_utc = datetime.now(timezone.utc)
-
-            # Check if it's in the future
-            if dt > now_utc:
-                raise ValueError("recorded_at cannot be in the future")
-
-            # Extract the local time components from the user's timezone
-            # This preserves the exact time the user sees (e.g., 00:17 stays as 00:17)
-            if dt.tzinfo is not None:
-                # Create a naive datetime with the same local time values
-                return datetime(
-                    dt.year,
-                    dt.month,
-                    dt.day,
-                    dt.hour,
-                    dt.minute,
-                    dt.second,
-                    dt.microsecond,
-                )
-            else:
-                return dt
-
-        # If it's already a datetime object (shouldn't happen with mode="before")
-        if isinstance(v, datetime):
-            now_utc = datetime.now(timezone.utc)
-
-            if v.tzinfo is not None:
-                if v > now_utc:
-                    raise ValueError("recorded_at cannot be in the future")
-                # Extract local time components
-                return datetime(
-                    v.year, v.month, v.day, v.hour, v.minute, v.second, v.microsecond
-                )
-            else:
-                now_naive = datetime.now()
-                if v > now_naive:
-                    raise ValueError("recorded_at cannot be in the future")
-                return v
-
-        return v
+        return _validate_not_future(v, "recorded_at cannot be in the future")
 
 
 class VitalsResponse(VitalsBase):
@@ -357,6 +250,7 @@ class VitalsResponse(VitalsBase):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class VitalsWithRecorder(VitalsResponse):
@@ -364,16 +258,16 @@ class VitalsWithRecorder(VitalsResponse):
 
     recorded_by_name: Optional[str] = None
 
-    class Config:
-        from_attributes = True
-
 
 # ============================================================================
 # Vitals Trends Schemas
 # ============================================================================
 
 
-class VitalTrend(BaseModel):
+# Slotted dataclass rather than a BaseModel: trends carry up to five series
+# of these points and they only exist to be serialized
+@dataclass(slots=True, frozen=True)
+class VitalTrend:
     """Schema for vital trend data point."""
 
     timestamp: datetime
@@ -1,13 +1,25 @@
 """Patient and Vitals Service Layer."""
 
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import (
+    select,
+    func,
+    and_,
+    bindparam,
+    desc,
+    exists,
+    insert,
+    literal,
+    tuple_,
+    Interval,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
 from app.domain.auth.models import Hospital, User
 from app.domain.patients.models import Patient, PatientVitals
@@ -16,6 +28,20 @@ from app.domain.patients.schemas import (
     PatientUpdate,
     VitalsCreate,
     VitalsEntryCheckResponse,
+    VitalTrend,
+)
+
+# Per-process cache of 12-hour check results: patient_id -> (cached_at, response).
+# Insertion order follows cached_at, so the oldest entry is always first.
+# Entries are dropped when create_vitals inserts a row for the patient.
+_can_enter_cache: dict[UUID, tuple[float, VitalsEntryCheckResponse]] = {}
+
+# Hot-path statements built once at import; only the bound patient_id varies.
+_LATEST_VITALS_STMT = (
+    select(PatientVitals)
+    .where(PatientVitals.patient_id == bindparam("patient_id"))
+    .order_by(desc(PatientVitals.recorded_at))
+    .limit(1)
 )
 
 
@@ -28,27 +54,29 @@ class PatientService:
         patient_data: PatientCreate,
     ) -> Patient:
         """Create a new patient with optional initial vitals."""
-        # Check if hospital exists
-        hospital_result = await db.execute(
-            select(Hospital).where(Hospital.id == patient_data.hospital_id)
+        # Check hospital exists and MRN is unused in one round-trip.
+        # uq_patient_mrn_hospital still guards against concurrent inserts.
+        checks = await db.execute(
+            select(
+                exists().where(Hospital.id == patient_data.hospital_id),
+                exists().where(
+                    and_(
+                        Patient.mrn == patient_data.mrn,
+                        Patient.hospital_id == patient_data.hospital_id,
+                    )
+                ),
+            )
         )
-        hospital = hospital_result.scalar_one_or_none()
-        if not hospital:
+        hospital_exists, mrn_taken = checks.one()
+
+        if not hospital_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Hospital not found",
             )
 
         # Check for duplicate MRN in the same hospital
-        existing_patient = await db.execute(
-            select(Patient).where(
-                and_(
-                    Patient.mrn == patient_data.mrn,
-                    Patient.hospital_id == patient_data.hospital_id,
-                )
-            )
-        )
-        if existing_patient.scalar_one_or_none():
+        if mrn_taken:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Patient with MRN {patient_data.mrn} already exists in this hospital",
@@ -57,23 +85,30 @@ class PatientService:
         # Extract initial vitals if provided
         initial_vitals_data = patient_data.initial_vitals
 
-        # Create patient (exclude initial_vitals from patient data)
-        patient_dict = patient_data.model_dump(exclude={"initial_vitals"})
-        patient = Patient(**patient_dict)
-        db.add(patient)
-        await db.commit()
-        await db.refresh(patient)
+        # Create patient (exclude initial_vitals from patient data).
+        # Fields are flat scalars, so read them directly instead of model_dump()
+        patient_dict = {
+            field: value
+            for field, value in vars(patient_data).items()
+            if field != "initial_vitals"
+        }
+        # INSERT ... RETURNING loads server-filled columns without a refresh()
+        result = await db.scalars(
+            insert(Patient).values(**patient_dict).returning(Patient)
+        )
+        patient = result.one()
 
         # If initial vitals were provided, create vitals entry at admission time
         if initial_vitals_data:
-            vitals = PatientVitals(
-                patient_id=patient.id,
-                recorded_at=patient.admission_date,
-                **initial_vitals_data.model_dump(exclude_none=True),
+            await db.execute(
+                insert(PatientVitals).values(
+                    patient_id=patient.id,
+                    recorded_at=patient.admission_date,
+                    **initial_vitals_data.model_dump(exclude_none=True),
+                )
             )
-            db.add(vitals)
-            await db.commit()
 
+        await db.commit()
         return patient
 
     @staticmethod
@@ -86,11 +121,7 @@ class PatientService:
         Get patient by ID.
         If user_hospital_id is provided, verifies the patient belongs to that hospital.
         """
-        query = (
-            select(Patient)
-            .options(selectinload(Patient.hospital))
-            .where(Patient.id == patient_id)
-        )
+        query = select(Patient).where(Patient.id == patient_id)
 
         # Hospital verification: only return patient if it belongs to user's hospital
         if user_hospital_id:
@@ -182,6 +213,16 @@ class VitalsService:
     """Service for patient vitals operations."""
 
     VITALS_INTERVAL_HOURS = 12
+    TREND_FIELDS = ("pao2", "paco2", "lactate", "ph", "hco3")
+    TREND_DOWNSAMPLE_AFTER_HOURS = 48
+    TREND_MAX_POINTS = 500
+    CAN_ENTER_CACHE_TTL_SECONDS = 60
+    CAN_ENTER_CACHE_MAX_ENTRIES = 1024
+    # Raw asyncpg query for un-downsampled trend windows
+    TREND_RAW_SQL = (
+        f"SELECT recorded_at, {', '.join(TREND_FIELDS)} FROM patient_vitals "
+        "WHERE patient_id = $1 AND recorded_at >= $2 ORDER BY recorded_at"
+    )
 
     @staticmethod
     async def check_can_enter_vitals(
@@ -191,18 +232,65 @@ class VitalsService:
         """
         Check if vitals can be entered for a patient.
         Vitals can only be entered once every 12 hours.
+
+        Results are cached per patient for up to CAN_ENTER_CACHE_TTL_SECONDS,
+        and never past the moment a denied patient becomes eligible again.
+        The cache holds at most CAN_ENTER_CACHE_MAX_ENTRIES patients.
+
+        The cache is per worker process: only the worker that inserts vitals
+        invalidates its entry, so another worker may report can_enter=True
+        for up to CAN_ENTER_CACHE_TTL_SECONDS afterwards. create_vitals
+        re-checks the 12-hour rule in its INSERT, so a stale answer can
+        never admit a second entry.
+        """
+        now = time.time()
+        cached = _can_enter_cache.get(patient_id)
+        if cached is not None:
+            cached_at, response = cached
+            ttl = VitalsService.CAN_ENTER_CACHE_TTL_SECONDS
+            if response.next_allowed_time is not None:
+                ttl = min(
+                    ttl,
+                    (response.next_allowed_time - datetime.utcnow()).total_seconds(),
+                )
+            if cached_at + ttl > now:
+                return response
+
+        response = await VitalsService._query_can_enter_vitals(db, patient_id)
+        # Re-insert at the end so dict order keeps tracking cached_at
+        _can_enter_cache.pop(patient_id, None)
+        _can_enter_cache[patient_id] = (now, response)
+
+        # Evict from the oldest end: expired entries, then live ones while
+        # over the size cap
+        expired_before = now - VitalsService.CAN_ENTER_CACHE_TTL_SECONDS
+        while _can_enter_cache:
+            oldest = next(iter(_can_enter_cache))
+            if (
+                _can_enter_cache[oldest][0] > expired_before
+                and len(_can_enter_cache) <= VitalsService.CAN_ENTER_CACHE_MAX_ENTRIES
+            ):
+                break
+            del _can_enter_cache[oldest]
+        return response
+
+    @staticmethod
+    async def _query_can_enter_vitals(
+        db: AsyncSession,
+        patient_id: UUID,
+    ) -> VitalsEntryCheckResponse:
+        """
+        Run the 12-hour check against the database.
+
+        All response fields are computed server-side, so the response is
+        built with model_construct() and skips validation.
         """
         # Get the most recent vitals entry for this patient
-        result = await db.execute(
-            select(PatientVitals)
-            .where(PatientVitals.patient_id == patient_id)
-            .order_by(desc(PatientVitals.recorded_at))
-            .limit(1)
-        )
+        result = await db.execute(_LATEST_VITALS_STMT, {"patient_id": patient_id})
         last_vitals = result.scalar_one_or_none()
 
         if not last_vitals:
-            return VitalsEntryCheckResponse(
+            return VitalsEntryCheckResponse.model_construct(
                 can_enter=True,
                 message="No previous vitals found. You can enter vitals now.",
             )
@@ -213,7 +301,7 @@ class VitalsService:
         hours_since_last = time_since_last.total_seconds() / 3600
 
         if hours_since_last >= VitalsService.VITALS_INTERVAL_HOURS:
-            return VitalsEntryCheckResponse(
+            return VitalsEntryCheckResponse.model_construct(
                 can_enter=True,
                 last_entry_time=last_vitals.recorded_at,
                 hours_since_last_entry=hours_since_last,
@@ -225,14 +313,14 @@ class VitalsService:
             )
             hours_remaining = VitalsService.VITALS_INTERVAL_HOURS - hours_since_last
 
-            return VitalsEntryCheckResponse(
+            return VitalsEntryCheckResponse.model_construct(
                 can_enter=False,
                 last_entry_time=last_vitals.recorded_at,
                 hours_since_last_entry=hours_since_last,
                 next_allowed_time=next_allowed,
                 message=f"Vitals were entered {hours_since_last:.1f} hours ago. "
                 f"Please wait {hours_remaining:.1f} more hours. "
-                f"Next entry allowed at {next_allowed.strftime('%Y-%m-%d %H:%M UTC')}.",
+                f"Next entry allowed at {next_allowed.isoformat(sep=' ', timespec='minutes')} UTC.",
             )
 
     @staticmethod
@@ -245,35 +333,61 @@ class VitalsService:
         """
         Create a new vitals entry with 12-hour validation.
         Verifies the patient belongs to the user's hospital.
+
+        The hospital and 12-hour checks are folded into a single
+        INSERT ... SELECT ... WHERE, so the happy path is one round-trip.
+        Only a rejected insert re-queries to report why.
         """
-        # Check if patient exists AND belongs to user's hospital
-        patient = await PatientService.get_patient(
-            db, vitals_data.patient_id, user_hospital_id
+        patient_id = vitals_data.patient_id
+        cutoff_time = datetime.utcnow() - timedelta(
+            hours=VitalsService.VITALS_INTERVAL_HOURS
+        )
+
+        values = {**vars(vitals_data), "recorded_by": recorded_by_user_id}
+        columns = PatientVitals.__table__.c
+        guarded_values = select(
+            *(literal(value, columns[name].type) for name, value in values.items())
+        ).where(
+            # Patient exists AND belongs to user's hospital
+            exists().where(
+                and_(
+                    Patient.id == patient_id,
+                    Patient.hospital_id == user_hospital_id,
+                )
+            ),
+            # No vitals recorded within the last 12 hours
+            ~exists().where(
+                and_(
+                    PatientVitals.patient_id == patient_id,
+                    PatientVitals.recorded_at > cutoff_time,
+                )
+            ),
         )
-        if not patient:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Patient not found or does not belong to your hospital",
-            )
 
-        # Check 12-hour constraint
-        can_enter = await VitalsService.check_can_enter_vitals(
-            db, vitals_data.patient_id
+        result = await db.scalars(
+            insert(PatientVitals)
+            # include_defaults fills id and created_at from the column defaults
+            .from_select(list(values), guarded_values, include_defaults=True)
+            .returning(PatientVitals)
         )
-        if not can_enter.can_enter:
+        vitals = result.one_or_none()
+
+        if vitals is None:
+            patient = await PatientService.get_patient(db, patient_id, user_hospital_id)
+            if not patient:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Patient not found or does not belong to your hospital",
+                )
+
+            can_enter = await VitalsService._query_can_enter_vitals(db, patient_id)
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=can_enter.message,
             )
 
-        # Create vitals entry
-        vitals = PatientVitals(
-            **vitals_data.model_dump(),
-            recorded_by=recorded_by_user_id,
-        )
-        db.add(vitals)
         await db.commit()
-        await db.refresh(vitals)
+        _can_enter_cache.pop(patient_id, None)
         return vitals
 
     @staticmethod
@@ -282,12 +396,7 @@ class VitalsService:
         patient_id: UUID,
     ) -> Optional[PatientVitals]:
         """Get the most recent vitals for a patient."""
-        result = await db.execute(
-            select(PatientVitals)
-            .where(PatientVitals.patient_id == patient_id)
-            .order_by(desc(PatientVitals.recorded_at))
-            .limit(1)
-        )
+        result = await db.execute(_LATEST_VITALS_STMT, {"patient_id": patient_id})
         return result.scalar_one_or_none()
 
     @staticmethod
@@ -297,16 +406,37 @@ class VitalsService:
         hours: Optional[int] = None,
         limit: int = 100,
         offset: int = 0,
+        before: Optional[datetime] = None,
+        before_id: Optional[UUID] = None,
     ) -> list[PatientVitals]:
-        """Get vitals history for a patient with optional time filter."""
+        """
+        Get vitals history for a patient with optional time filter.
+
+        Pass the recorded_at and id of the last row already seen as `before`
+        and `before_id` to fetch the next page (keyset pagination). Unlike
+        `offset`, each page costs O(limit) on the (patient_id, recorded_at
+        DESC) index at any depth. The id breaks ties between rows sharing a
+        timestamp, so `before` and `before_id` must be given together, and
+        `offset` must not be combined with them.
+        """
         query = select(PatientVitals).where(PatientVitals.patient_id == patient_id)
 
         if hours:
             cutoff_time = datetime.utcnow() - timedelta(hours=hours)
             query = query.where(PatientVitals.recorded_at >= cutoff_time)
 
+        if before is not None:
+            # recorded_at is naive; drop any offset like the schema validators
+            before = before.replace(tzinfo=None)
+            query = query.where(
+                tuple_(PatientVitals.recorded_at, PatientVitals.id)
+                < tuple_(before, before_id)
+            )
+
         query = (
-            query.order_by(desc(PatientVitals.recorded_at)).limit(limit).offset(offset)
+            query.order_by(desc(PatientVitals.recorded_at), desc(PatientVitals.id))
+            .limit(limit)
+            .offset(offset)
         )
 
         result = await db.execute(query)
@@ -321,48 +451,71 @@ class VitalsService:
         """
         Get vitals trends for graphing.
         Returns time-series data for PaO2, PaCO2, Lactate, pH, HCO3.
+
+        Windows longer than TREND_DOWNSAMPLE_AFTER_HOURS (and all-time) are
+        averaged in Postgres into at most TREND_MAX_POINTS time buckets. Each
+        point keeps the earliest timestamp of its bucket, so sparse data
+        comes back unchanged.
         """
-        query = select(PatientVitals).where(PatientVitals.patient_id == patient_id)
+        now = datetime.utcnow()
+        recorded_at = PatientVitals.recorded_at
+        trend_columns = [
+            getattr(PatientVitals, field) for field in VitalsService.TREND_FIELDS
+        ]
 
+        filters = [PatientVitals.patient_id == patient_id]
         if hours:
-            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-            query = query.where(PatientVitals.recorded_at >= cutoff_time)
-
-        query = query.order_by(PatientVitals.recorded_at)
-
-        result = await db.execute(query)
-        vitals_list = result.scalars().all()
+            cutoff_time = now - timedelta(hours=hours)
+            filters.append(recorded_at >= cutoff_time)
+
+        if hours and hours <= VitalsService.TREND_DOWNSAMPLE_AFTER_HOURS:
+            # Every row in the window is returned, so fetch asyncpg Records
+            # directly and skip SQLAlchemy result processing per row
+            conn = await db.connection()
+            raw_conn = (await conn.get_raw_connection()).driver_connection
+            rows = await raw_conn.fetch(
+                VitalsService.TREND_RAW_SQL, patient_id, cutoff_time
+            )
+        else:
+            # Bucket width = window / TREND_MAX_POINTS (date_bin needs PG 14+)
+            if hours:
+                window = literal(timedelta(hours=hours))
+            else:
+                first_recorded = (
+                    select(func.min(recorded_at))
+                    .where(PatientVitals.patient_id == patient_id)
+                    .scalar_subquery()
+                )
+                window = literal(now) - first_recorded
+            stride = func.greatest(
+                window.self_group().op("/", return_type=Interval)(
+                    VitalsService.TREND_MAX_POINTS
+                ),
+                literal(timedelta(seconds=1)),
+            )
+            bucket = func.date_bin(stride, recorded_at, literal(datetime(2000, 1, 1)))
+            query = (
+                select(
+                    func.min(recorded_at),
+                    *(func.avg(column) for column in trend_columns),
+                )
+                .where(*filters)
+                .group_by(bucket)
+                .order_by(func.min(recorded_at))
+            )
+            rows = (await db.execute(query)).all()
 
         # Build trend data
         trends = {
             "patient_id": patient_id,
             "time_range_hours": hours,
-            "pao2": [],
-            "paco2": [],
-            "lactate": [],
-            "ph": [],
-            "hco3": [],
         }
-
-        for vital in vitals_list:
-            if vital.pao2 is not None:
-                trends["pao2"].append(
-                    {"timestamp": vital.recorded_at, "value": vital.pao2}
-                )
-            if vital.paco2 is not None:
-                trends["paco2"].append(
-                    {"timestamp": vital.recorded_at, "value": vital.paco2}
-                )
-            if vital.lactate is not None:
-                trends["lactate"].append(
-                    {"timestamp": vital.recorded_at, "value": vital.lactate}
-                )
-            if vital.ph is not None:
-                trends["ph"].append({"timestamp": vital.recorded_at, "value": vital.ph})
-            if vital.hco3 is not None:
-                trends["hco3"].append(
-                    {"timestamp": vital.recorded_at, "value": vital.hco3}
-                )
+        # One comprehension per series; points are built as VitalTrend
+        # directly so the response needs no re-validation
+        for index, field in enumerate(VitalsService.TREND_FIELDS, start=1):
+            trends[field] = [
+                VitalTrend(row[0], row[index]) for row in rows if row[index] is not None
+            ]
 
         return trends
 
@@ -374,27 +527,58 @@ class VitalsService:
         """
         Get all active patients for a hospital with their latest vitals.
         Used for dashboard display.
-        """
-        patients = await PatientService.get_active_patients_by_hospital(db, hospital_id)
 
-        result = []
-        for patient in patients:
-            latest_vitals = await VitalsService.get_latest_vitals(db, patient.id)
-
-            # Count total vitals entries
-            vitals_count_result = await db.execute(
-                select(func.count(PatientVitals.id)).where(
-                    PatientVitals.patient_id == patient.id
+        Fetches patients, latest vitals and vitals counts in a single query
+        using window functions instead of two extra queries per patient.
+        """
+        active_patient_ids = select(Patient.id).where(
+            and_(
+                Patient.hospital_id == hospital_id,
+                Patient.is_active == True,  # noqa: E712
+            )
+        )
+        ranked = (
+            select(
+                PatientVitals,
+                func.row_number()
+                .over(
+                    partition_by=PatientVitals.patient_id,
+                    order_by=desc(PatientVitals.recorded_at),
                 )
+                .label("rn"),
+                func.count()
+                .over(partition_by=PatientVitals.patient_id)
+                .label("vitals_count"),
             )
-            vitals_count = vitals_count_result.scalar_one()
-
-            result.append(
-                {
-                    "patient": patient,
-                    "latest_vitals": latest_vitals,
-                    "vitals_count": vitals_count,
-                }
+            .where(PatientVitals.patient_id.in_(active_patient_ids))
+            .subquery()
+        )
+        latest_vitals = aliased(PatientVitals, ranked)
+
+        rows = await db.execute(
+            select(
+                Patient,
+                latest_vitals,
+                func.coalesce(ranked.c.vitals_count, 0),
+            )
+            .outerjoin(
+                ranked,
+                and_(ranked.c.patient_id == Patient.id, ranked.c.rn == 1),
+            )
+            .where(
+                and_(
+                    Patient.hospital_id == hospital_id,
+                    Patient.is_active == True,  # noqa: E712
+                )
             )
+            .order_by(Patient.last_name, Patient.first_name)
+        )
 
-        return result
+        return [
+            {
+                "patient": patient,
+                "latest_vitals": vitals,
+                "vitals_count": vitals_count,
+            }
+            for patient, vitals, vitals_count in rows.all()
+        ]
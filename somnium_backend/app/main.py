@@ -2,6 +2,9 @@
 Somnium ECMO Platform - Main FastAPI Application
 """
 
+import asyncio
+import json
+import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -14,7 +17,7 @@ from sqlalchemy.exc import IntegrityError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from fastapi_csrf_protect import CsrfProtect
 from fastapi_csrf_protect.exceptions import CsrfProtectError
 from pydantic import BaseModel
@@ -28,6 +31,12 @@ from app.core.exceptions import (
     integrity_exception_handler,
     general_exception_handler,
 )
+from app.domain.auth.router import router as auth_router
+from app.domain.patients.router import router as patients_router
+
+
+# Handlers and levels come from uvicorn's --log-config (log_config.json)
+logger = logging.getLogger(__name__)
 
 
 # CSRF Settings
@@ -51,44 +60,104 @@ def get_csrf_config():
     return CsrfSettings()
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Config lives on the CsrfProtect class, so one shared instance is enough
+_csrf_protect = CsrfProtect()
+
+
+class SecurityHeadersMiddleware:
     """
     Add security headers to all responses for HIPAA/SOC2 compliance.
+
+    Implemented as plain ASGI middleware that injects the headers into the
+    http.response.start message, avoiding BaseHTTPMiddleware's per-request
+    task group and response stream.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    # Stored as raw ASGI (name, value) byte pairs so nothing, including the
+    # long CSP and Permissions-Policy values, is encoded per response
+    SECURITY_HEADERS = (
         # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
+        (b"x-frame-options", b"DENY"),
         # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        (b"x-content-type-options", b"nosniff"),
         # Enable XSS protection (legacy browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
+        (b"x-xss-protection", b"1; mode=block"),
         # Force HTTPS (max-age = 1 year)
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains; preload"
-        )
+        (
+            b"strict-transport-security",
+            b"max-age=31536000; includeSubDomains; preload",
+        ),
         # Content Security Policy
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' data:; "
-            "connect-src 'self'; "
-            "frame-ancestors 'none'"
-        )
+        (
+            b"content-security-policy",
+            b"default-src 'self'; "
+            b"script-src 'self'; "
+            b"style-src 'self' 'unsafe-inline'; "
+            b"img-src 'self' data: https:; "
+            b"font-src 'self' data:; "
+            b"connect-src 'self'; "
+            b"frame-ancestors 'none'",
+        ),
         # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
         # Permissions policy (disable unnecessary features)
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=(), payment=()"
-        )
-        return response
+        (
+            b"permissions-policy",
+            b"geolocation=(), microphone=(), camera=(), payment=()",
+        ),
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
+                headers.extend(
+                    header
+                    for header in self.SECURITY_HEADERS
+                    if header[0] not in present
+                )
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class HealthCheckHTTPSRedirectMiddleware(HTTPSRedirectMiddleware):
+    """
+    Redirect HTTP to HTTPS, except for health probes.
+
+    Load balancer and orchestrator health checks often use plain HTTP;
+    answering them directly avoids a 307 and a TLS handshake per probe.
+    """
+
+    EXEMPT_PATHS = frozenset({"/health"})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
 
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/hour"])
+# Initialize rate limiter (Redis-backed when REDIS_URL is set)
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["100/hour"],
+    storage_uri=settings.REDIS_URL or "memory://",
+)
+
+
+# Independent coroutines run concurrently by lifespan()
+STARTUP_TASKS = (init_db,)
+SHUTDOWN_TASKS = (close_db,)
 
 
 @asynccontextmanager
@@ -99,23 +168,51 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Handles:
     - Database initialization on startup
     - Database connection cleanup on shutdown
+
+    Independent startup/shutdown coroutines run concurrently in a TaskGroup,
+    so adding one (cache warm-up, model load) doesn't extend cold start by
+    its full duration.
     """
     # Startup
-    print("🚀 Starting Somnium ECMO Platform...")
-    print("📊 Initializing database connection...")
-    await init_db()
-    print("✅ Database initialized successfully")
-    print(f"🌐 CORS enabled for origins: {settings.CORS_ORIGINS}")
-    print(f"🔒 Security: JWT with {settings.ALGORITHM}")
-    print("✨ Somnium backend ready!")
+    logger.info("🚀 Starting Somnium ECMO Platform...")
+    logger.info("📊 Initializing database connection...")
+    async with asyncio.TaskGroup() as tg:
+        for startup_task in STARTUP_TASKS:
+            tg.create_task(startup_task())
+    logger.info("✅ Database initialized successfully")
+    logger.info("🌐 CORS enabled for origins: %s", settings.CORS_ORIGINS)
+    logger.info("🔒 Security: JWT with %s", settings.ALGORITHM)
+    logger.info("✨ Somnium backend ready!")
 
     yield
 
     # Shutdown
-    print("🛑 Shutting down Somnium platform...")
-    await close_db()
-    print("✅ Database connections closed")
-    print("👋 Shutdown complete")
+    logger.info("🛑 Shutting down Somnium platform...")
+    async with asyncio.TaskGroup() as tg:
+        for shutdown_task in SHUTDOWN_TASKS:
+            tg.create_task(shutdown_task())
+    logger.info("✅ Database connections closed")
+    logger.info("👋 Shutdown complete")
+
+
+# CSRF Exception Handler
+async def csrf_protect_exception_handler(request: Request, exc: CsrfProtectError):
+    """Handle CSRF protection errors."""
+    return JSONResponse(
+        status_code=status.HTTP_403_FORBIDDEN,
+        content={"detail": "CSRF token validation failed"},
+    )
+
+
+# Exception Handlers (resolved by Starlette along each exception's MRO)
+_EXCEPTION_HANDLERS = {
+    RateLimitExceeded: _rate_limit_exceeded_handler,
+    CsrfProtectError: csrf_protect_exception_handler,
+    SomniumException: somnium_exception_handler,
+    RequestValidationError: validation_exception_handler,
+    IntegrityError: integrity_exception_handler,
+    Exception: general_exception_handler,
+}
 
 
 # Create FastAPI application
@@ -126,13 +223,14 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    exception_handlers=_EXCEPTION_HANDLERS,
     lifespan=lifespan,
 )
 
 # Security Middleware (order matters!)
-# 1. HTTPS Redirect (only in production)
+# 1. HTTPS Redirect (only in production, health probes exempt)
 if not settings.DEBUG:
-    app.add_middleware(HTTPSRedirectMiddleware)
+    app.add_middleware(HealthCheckHTTPSRedirectMiddleware)
 
 # 2. Trusted Host (prevent Host header attacks)
 # app.add_middleware(
@@ -156,28 +254,31 @@ app.add_middleware(
         "X-CSRF-Token",
     ],  # Include CSRF token header
     expose_headers=["X-Total-Count"],  # Only expose what's needed
-    max_age=600,  # Cache preflight for 10 minutes
+    max_age=86400,  # Cache preflight for 24h (browsers clamp to their own maximum)
 )
 
 # Rate Limiter
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Exception Handlers
-app.add_exception_handler(SomniumException, somnium_exception_handler)
-app.add_exception_handler(RequestValidationError, validation_exception_handler)
-app.add_exception_handler(IntegrityError, integrity_exception_handler)
-app.add_exception_handler(Exception, general_exception_handler)
 
-
-# CSRF Exception Handler
-@app.exception_handler(CsrfProtectError)
-async def csrf_protect_exception_handler(request: Request, exc: CsrfProtectError):
-    """Handle CSRF protection errors."""
-    return JSONResponse(
-        status_code=status.HTTP_403_FORBIDDEN,
-        content={"detail": "CSRF token validation failed"},
-    )
+# Static probe responses, serialized once at import
+_HEALTH_BODY = json.dumps(
+    {
+        "status": "healthy",
+        "service": settings.APP_NAME,
+        "version": settings.APP_VERSION,
+    },
+    separators=(",", ":"),
+).encode("utf-8")
+_ROOT_BODY = json.dumps(
+    {
+        "message": "Welcome to Somnium ECMO Platform API",
+        "version": settings.APP_VERSION,
+        "docs": "/api/docs",
+        "health": "/health",
+    },
+    separators=(",", ":"),
+).encode("utf-8")
 
 
 # Health Check Endpoint
@@ -187,32 +288,32 @@ async def csrf_protect_exception_handler(request: Request, exc: CsrfProtectError
     summary="Health check endpoint",
     status_code=status.HTTP_200_OK,
 )
-async def health_check() -> JSONResponse:
+async def health_check() -> Response:
     """
     Health check endpoint to verify the API is running.
 
     Returns:
-        JSONResponse: Status and version information
+        Response: Status and version information
     """
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "service": settings.APP_NAME,
-            "version": settings.APP_VERSION,
-        }
-    )
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # Root endpoint
 @app.get("/", tags=["Root"])
-async def root() -> dict:
+async def root() -> Response:
     """Root endpoint with API information."""
-    return {
-        "message": "Welcome to Somnium ECMO Platform API",
-        "version": settings.APP_VERSION,
-        "docs": "/api/docs",
-        "health": "/health",
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+# CSRF cookie attributes, resolved from settings once at import
+_CSRF_COOKIE_KWARGS = {
+    "key": settings.CSRF_COOKIE_NAME,
+    "max_age": 3600,  # 1 hour
+    "httponly": False,  # Must be accessible by JavaScript
+    "secure": not settings.DEBUG,
+    "samesite": "lax",
+    "path": "/",
+}
 
 
 # CSRF Token Endpoint
@@ -229,27 +330,15 @@ async def get_csrf_token(request: Request, response: Response):
     Returns:
         CSRF token that should be included in X-CSRF-Token header
     """
-    csrf_protect = CsrfProtect()
-    csrf_token, signed_token = csrf_protect.generate_csrf_tokens()
+    csrf_token, signed_token = _csrf_protect.generate_csrf_tokens()
 
     # Set CSRF token in cookie
-    response.set_cookie(
-        key=settings.CSRF_COOKIE_NAME,
-        value=signed_token,
-        max_age=3600,  # 1 hour
-        httponly=False,  # Must be accessible by JavaScript
-        secure=not settings.DEBUG,
-        samesite="lax",
-        path="/",
-    )
+    response.set_cookie(value=signed_token, **_CSRF_COOKIE_KWARGS)
 
     return {"csrf_token": csrf_token}
 
 
 # Register domain routers
-from app.domain.auth.router import router as auth_router
-from app.domain.patients.router import router as patients_router
-
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(patients_router, tags=["Patients"])
 
@@ -3,6 +3,10 @@ Reset users and create test users with proper hospital email domains.
 """
 
 import asyncio
+import logging
+import sys
+from itertools import groupby
+
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,23 +14,24 @@ from app.core.database import AsyncSessionLocal
 from app.domain.auth.models import User, Hospital, UserRole, AuditLog, RefreshToken
 from app.core.security import get_password_hash
 
+logger = logging.getLogger(__name__)
+
 
 async def reset_and_seed_users():
     """Delete all users and create new test users with hospital emails."""
-    async with AsyncSessionLocal() as session:
+    # One transaction for the whole reset: a single commit, and nothing is
+    # half-applied if a step fails
+    async with AsyncSessionLocal() as session, session.begin():
         # Delete dependent tables first (foreign key constraints)
         await session.execute(delete(AuditLog))
-        await session.commit()
-        print("✓ Deleted all audit logs")
+        logger.info("✓ Deleted all audit logs")
 
         await session.execute(delete(RefreshToken))
-        await session.commit()
-        print("✓ Deleted all refresh tokens")
+        logger.info("✓ Deleted all refresh tokens")
 
         # Delete all existing users
         await session.execute(delete(User))
-        await session.commit()
-        print("✓ Deleted all existing users")
+        logger.info("✓ Deleted all existing users")
 
         # Get some hospitals for test users
         stmt = select(Hospital).limit(10)
@@ -34,10 +39,12 @@ async def reset_and_seed_users():
         hospitals = list(result.scalars().all())
 
         if not hospitals:
-            print("❌ No hospitals found! Run migrations first.")
+            logger.error("❌ No hospitals found! Run migrations first.")
+            # Returning from the block would commit the deletes above
+            await session.rollback()
             return
 
-        print(f"✓ Found {len(hospitals)} hospitals")
+        logger.info("✓ Found %d hospitals", len(hospitals))
 
         # Test users with proper hospital email domains
         # Password for all: TestPassword123!
@@ -124,46 +131,53 @@ async def reset_and_seed_users():
                 ]
             )
 
+        # Hash each distinct password once (bcrypt is deliberately slow)
+        password_hashes = {
+            password: get_password_hash(password)
+            for password in {user_data["password"] for user_data in test_users}
+        }
+
         # Create users
         for user_data in test_users:
             user = User(
                 email=user_data["email"],
-                hashed_password=get_password_hash(user_data["password"]),
+                hashed_password=password_hashes[user_data["password"]],
                 full_name=user_data["full_name"],
                 role=user_data["role"],
                 hospital_id=user_data["hospital_id"],
                 department=user_data["department"],
             )
             session.add(user)
-
-        await session.commit()
-        print(f"\n✓ Created {len(test_users)} test users")
-
-        # Display created users grouped by hospital
-        print("\n" + "=" * 80)
-        print("TEST USERS CREATED")
-        print("=" * 80)
-        print("\nPassword for all users: TestPassword123!\n")
-
-        stmt = select(Hospital).order_by(Hospital.name)
+        await session.flush()
+        logger.info("\n✓ Created %d test users", len(test_users))
+
+        # One join instead of a users query per hospital
+        stmt = (
+            select(Hospital, User)
+            .join(User, User.hospital_id == Hospital.id)
+            .order_by(Hospital.name, Hospital.id, User.role)
+        )
         result = await session.execute(stmt)
-        all_hospitals = list(result.scalars().all())
 
-        for hospital in all_hospitals:
-            stmt = (
-                select(User).where(User.hospital_id == hospital.id).order_by(User.role)
+        # Display created users grouped by hospital
+        lines = [
+            "\n" + "=" * 80,
+            "TEST USERS CREATED",
+            "=" * 80,
+            "\nPassword for all users: TestPassword123!\n",
+        ]
+        for _, rows in groupby(result.all(), key=lambda row: row[0].id):
+            rows = list(rows)
+            hospital = rows[0][0]
+            lines.append(f"\n{hospital.name} (@{hospital.email_domain})")
+            lines.append("-" * 80)
+            lines.extend(
+                f"  {user.role.value.upper():20} | {user.email:40} | {user.full_name}"
+                for _, user in rows
             )
-            result = await session.execute(stmt)
-            hospital_users = list(result.scalars().all())
-
-            if hospital_users:
-                print(f"\n{hospital.name} (@{hospital.email_domain})")
-                print("-" * 80)
-                for user in hospital_users:
-                    print(
-                        f"  {user.role.value.upper():20} | {user.email:40} | {user.full_name}"
-                    )
+        logger.info("\n".join(lines))
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     asyncio.run(reset_and_seed_users())
@@ -6,17 +6,19 @@ Usage:
 """
 
 import asyncio
+import logging
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from uuid import UUID
-import random
+from uuid import uuid4
+
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from app.core.database import AsyncSessionLocal
 from app.domain.auth.models import Hospital, User
@@ -27,21 +29,26 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "app" / "domain" / "patients"))
 from models import Patient, PatientVitals, ECMOMode, PatientStatus, Gender
 
+logger = logging.getLogger(__name__)
+
 
 async def seed_patients_and_vitals():
     """Seed sample patients with realistic vitals data."""
-    async with AsyncSessionLocal() as db:
-        print("🌱 Starting patient and vitals seeding...")
+    # Patients and vitals are written in one transaction, committed on exit
+    async with AsyncSessionLocal() as db, db.begin():
+        logger.info("🌱 Starting patient and vitals seeding...")
 
         # Get first hospital
         hospital_result = await db.execute(select(Hospital).limit(1))
         hospital = hospital_result.scalar_one_or_none()
 
         if not hospital:
-            print("❌ No hospital found. Please run reset_and_seed_users.py first.")
+            logger.error(
+                "❌ No hospital found. Please run reset_and_seed_users.py first."
+            )
             return
 
-        print(f"✅ Using hospital: {hospital.name} (ID: {hospital.id})")
+        logger.info("✅ Using hospital: %s (ID: %s)", hospital.name, hospital.id)
 
         # Get a nurse user for recording vitals
         nurse_result = await db.execute(
@@ -52,10 +59,10 @@ async def seed_patients_and_vitals():
         nurse = nurse_result.scalar_one_or_none()
 
         if not nurse:
-            print("❌ No nurse found. Please run reset_and_seed_users.py first.")
+            logger.error("❌ No nurse found. Please run reset_and_seed_users.py first.")
             return
 
-        print(f"✅ Using nurse: {nurse.full_name} for recording vitals")
+        logger.info("✅ Using nurse: %s for recording vitals", nurse.full_name)
 
         # Sample patient data
         patients_data = [
@@ -136,31 +143,34 @@ async def seed_patients_and_vitals():
             },
         ]
 
-        created_patients = []
-
-        # Create patients
-        for patient_data in patients_data:
-            # Check if patient already exists
-            existing = await db.execute(
-                select(Patient).where(
-                    Patient.mrn == patient_data["mrn"],
-                    Patient.hospital_id == hospital.id,
-                )
+        # Check all MRNs in one query, then insert the new patients in one flush
+        existing_result = await db.execute(
+            select(Patient.mrn).where(
+                Patient.hospital_id == hospital.id,
+                Patient.mrn.in_([data["mrn"] for data in patients_data]),
             )
-            if existing.scalar_one_or_none():
-                print(f"⏭️  Patient {patient_data['mrn']} already exists, skipping...")
-                continue
-
-            patient = Patient(hospital_id=hospital.id, **patient_data)
-            db.add(patient)
-            await db.flush()  # Get the patient ID
-            created_patients.append(patient)
-            print(
-                f"✅ Created patient: {patient.first_name} {patient.last_name} (MRN: {patient.mrn})"
+        )
+        existing_mrns = set(existing_result.scalars().all())
+        for mrn in existing_mrns:
+            logger.warning("⏭️  Patient %s already exists, skipping...", mrn)
+
+        created_patients = [
+            Patient(hospital_id=hospital.id, **patient_data)
+            for patient_data in patients_data
+            if patient_data["mrn"] not in existing_mrns
+        ]
+        db.add_all(created_patients)
+        await db.flush()  # Get the patient IDs
+        for patient in created_patients:
+            logger.info(
+                "✅ Created patient: %s %s (MRN: %s)",
+                patient.first_name,
+                patient.last_name,
+                patient.mrn,
             )
 
         if not created_patients:
-            print(
+            logger.info(
                 "ℹ️  No new patients created. Loading existing patients for vitals seeding..."
             )
             result = await db.execute(
@@ -168,12 +178,12 @@ async def seed_patients_and_vitals():
             )
             created_patients = list(result.scalars().all())
 
-        # Commit patients
-        await db.commit()
-
         # Create vitals for each patient (multiple entries over time)
-        print("\n📊 Creating vitals entries...")
+        logger.info("\n📊 Creating vitals entries...")
 
+        rng = np.random.default_rng()
+        now = datetime.utcnow()
+        all_vitals = []
         for patient in created_patients:
             # Calculate days since ECMO start
             days_on_ecmo = (
@@ -183,68 +193,98 @@ async def seed_patients_and_vitals():
             )
             num_entries = min(days_on_ecmo * 2, 10)  # 2 entries per day, max 10
 
-            print(
-                f"  Creating {num_entries} vitals entries for {patient.first_name} {patient.last_name}..."
+            logger.info(
+                "  Creating %d vitals entries for %s %s...",
+                num_entries,
+                patient.first_name,
+                patient.last_name,
             )
 
-            for i in range(num_entries):
-                # Entries every 12 hours, going backwards from now
-                hours_ago = i * 12
-                recorded_at = datetime.utcnow() - timedelta(hours=hours_ago)
-
-                # Generate realistic vitals with some variation
-                # Trend: improve over time (lower lactate, better pH, better oxygenation)
-                trend_factor = 1 - (i / num_entries * 0.3)  # 0.7 to 1.0
-
-                vitals = PatientVitals(
-                    patient_id=patient.id,
-                    recorded_by=nurse.id,
-                    recorded_at=recorded_at,
-                    # Basic vitals
-                    heart_rate=random.randint(75, 110),
-                    blood_pressure_systolic=random.randint(110, 140),
-                    blood_pressure_diastolic=random.randint(65, 85),
-                    respiratory_rate=random.randint(16, 24),
-                    temperature=round(random.uniform(36.5, 37.8), 1),
-                    spo2=random.randint(92, 98),
-                    # ECMO-specific vitals
-                    cvp=round(random.uniform(8, 14), 1),
-                    pao2=round(random.uniform(80, 120) * trend_factor, 1),
-                    paco2=round(random.uniform(35, 50) / trend_factor, 1),
-                    ph=round(7.30 + (random.uniform(0, 0.15) * trend_factor), 2),
-                    lactate=round(random.uniform(1.5, 4.0) / trend_factor, 1),
-                    hco3=round(random.uniform(22, 28), 1),
-                    notes=(
-                        f"Routine ECMO monitoring - Day {i // 2 + 1}"
-                        if i % 2 == 0
-                        else None
-                    ),
+            # Entries every 12 hours, going backwards from now
+            entry = np.arange(num_entries)
+            recorded_at = [now - timedelta(hours=12 * int(i)) for i in entry]
+
+            # Generate realistic vitals with some variation, one column at a time
+            # Trend: improve over time (lower lactate, better pH, better oxygenation)
+            trend_factor = 1 - (entry / num_entries * 0.3)  # 0.7 to 1.0
+            columns = {
+                # Basic vitals
+                "heart_rate": rng.integers(75, 111, num_entries),
+                "blood_pressure_systolic": rng.integers(110, 141, num_entries),
+                "blood_pressure_diastolic": rng.integers(65, 86, num_entries),
+                "respiratory_rate": rng.integers(16, 25, num_entries),
+                "temperature": np.round(rng.uniform(36.5, 37.8, num_entries), 1),
+                "spo2": rng.integers(92, 99, num_entries),
+                # ECMO-specific vitals
+                "cvp": np.round(rng.uniform(8, 14, num_entries), 1),
+                "pao2": np.round(rng.uniform(80, 120, num_entries) * trend_factor, 1),
+                "paco2": np.round(rng.uniform(35, 50, num_entries) / trend_factor, 1),
+                "ph": np.round(
+                    7.30 + rng.uniform(0, 0.15, num_entries) * trend_factor, 2
+                ),
+                "lactate": np.round(
+                    rng.uniform(1.5, 4.0, num_entries) / trend_factor, 1
+                ),
+                "hco3": np.round(rng.uniform(22, 28, num_entries), 1),
+            }
+
+            # tolist() converts to plain Python ints/floats for the driver
+            for i, values in enumerate(
+                zip(*(column.tolist() for column in columns.values()))
+            ):
+                all_vitals.append(
+                    dict(
+                        zip(columns, values),
+                        # COPY bypasses the model's Python-side defaults
+                        id=uuid4(),
+                        created_at=now,
+                        patient_id=patient.id,
+                        recorded_by=nurse.id,
+                        recorded_at=recorded_at[i],
+                        notes=(
+                            f"Routine ECMO monitoring - Day {i // 2 + 1}"
+                            if i % 2 == 0
+                            else None
+                        ),
+                    )
                 )
-                db.add(vitals)
 
-        await db.commit()
+        # Stream every seeded vitals row through COPY FROM STDIN on the
+        # session's own asyncpg connection (same transaction as the patients)
+        if all_vitals:
+            conn = await db.connection()
+            raw_conn = (await conn.get_raw_connection()).driver_connection
+            await raw_conn.copy_records_to_table(
+                PatientVitals.__tablename__,
+                records=[tuple(row.values()) for row in all_vitals],
+                columns=list(all_vitals[0]),
+            )
 
-        print(
-            f"\n✅ Successfully seeded {len(created_patients)} patients with vitals data!"
+        logger.info(
+            "\n✅ Successfully seeded %d patients with vitals data!",
+            len(created_patients),
         )
-        print(f"🏥 Hospital: {hospital.name}")
-        print(f"👨‍⚕️ Vitals recorded by: {nurse.full_name}")
-        print("\n📋 Summary:")
-        for patient in created_patients:
-            vitals_count_result = await db.execute(
-                select(PatientVitals).where(PatientVitals.patient_id == patient.id)
-            )
-            vitals_count = len(list(vitals_count_result.scalars().all()))
-            print(
-                f"  • {patient.first_name} {patient.last_name}: {vitals_count} vitals entries"
-            )
+        logger.info("🏥 Hospital: %s", hospital.name)
+        logger.info("👨‍⚕️ Vitals recorded by: %s", nurse.full_name)
+        counts_result = await db.execute(
+            select(PatientVitals.patient_id, func.count())
+            .where(PatientVitals.patient_id.in_([p.id for p in created_patients]))
+            .group_by(PatientVitals.patient_id)
+        )
+        counts = dict(counts_result.all())
+        summary_lines = ["\n📋 Summary:"] + [
+            f"  • {patient.first_name} {patient.last_name}: {counts.get(patient.id, 0)} vitals entries"
+            for patient in created_patients
+        ]
+        logger.info("\n".join(summary_lines))
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("🌱 PATIENT & VITALS SEEDING SCRIPT")
-    print("=" * 60)
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    logger.info("=" * 60)
+    logger.info("🌱 PATIENT & VITALS SEEDING SCRIPT")
+    logger.info("=" * 60)
     asyncio.run(seed_patients_and_vitals())
-    print("\n" + "=" * 60)
-    print("✅ SEEDING COMPLETE!")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("✅ SEEDING COMPLETE!")
+    logger.info("=" * 60)
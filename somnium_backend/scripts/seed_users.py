@@ -3,75 +3,158 @@ Seed test users into the database.
 """
 
 import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import logging
+import sys
+from functools import lru_cache
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 from app.core.config import settings
-from app.domain.auth.models import UserRole
-from app.domain.auth.service import AuthService
+from app.core.security import get_password_hash
+from app.domain.auth.models import Hospital, User, UserRole
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """Return the shared async engine (always on the asyncpg driver, no SQL echo)."""
+    database_url = str(settings.DATABASE_URL)
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return create_async_engine(database_url, echo=False, pool_size=5, max_overflow=0)
 
 
 async def seed_test_users():
-    """Create test users for each role."""
-
-    # Create async engine
-    engine = create_async_engine(str(settings.DATABASE_URL), echo=True)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with async_session() as session:
-        auth_service = AuthService(session)
-
-        test_users = [
-            {
-                "email": "nurse@hospital.com",
-                "password": "Nurse@2025!Secure",
-                "full_name": "Jane Nurse",
-                "role": UserRole.NURSE,
-                "department": "ICU",
-            },
-            {
-                "email": "physician@hospital.com",
-                "password": "Physician@2025!Secure",
-                "full_name": "Dr. John Physician",
-                "role": UserRole.PHYSICIAN,
-                "department": "Cardiology",
-            },
-            {
-                "email": "ecmo@hospital.com",
-                "password": "ECMO@2025!Secure",
-                "full_name": "Dr. Emily ECMO",
-                "role": UserRole.ECMO_SPECIALIST,
-                "department": "ECMO Unit",
-            },
-            {
-                "email": "admin@hospital.com",
-                "password": "Admin@2025!Secure",
-                "full_name": "Admin User",
-                "role": UserRole.ADMIN,
-                "department": "Administration",
-            },
+    """
+    Create test users for each role.
+
+    Uses the shared engine from get_engine() and leaves disposing it to the
+    caller, so repeated calls reuse pooled connections.
+    """
+    test_users = [
+        {
+            "email": "nurse@hospital.com",
+            "password": "Nurse@2025!Secure",
+            "full_name": "Jane Nurse",
+            "role": UserRole.NURSE,
+            "department": "ICU",
+        },
+        {
+            "email": "physician@hospital.com",
+            "password": "Physician@2025!Secure",
+            "full_name": "Dr. John Physician",
+            "role": UserRole.PHYSICIAN,
+            "department": "Cardiology",
+        },
+        {
+            "email": "ecmo@hospital.com",
+            "password": "ECMO@2025!Secure",
+            "full_name": "Dr. Emily ECMO",
+            "role": UserRole.ECMO_SPECIALIST,
+            "department": "ECMO Unit",
+        },
+        {
+            "email": "admin@hospital.com",
+            "password": "Admin@2025!Secure",
+            "full_name": "Admin User",
+            "role": UserRole.ADMIN,
+            "department": "Administration",
+        },
+    ]
+
+    logger.info("🌱 Seeding test users...")
+
+    async_session = async_sessionmaker(get_engine(), expire_on_commit=False)
+
+    # bcrypt releases the GIL, so hash all passwords concurrently in threads.
+    # Start hashing before opening a session so it overlaps the connection
+    # checkout and hospital lookup; the TaskGroup ensures the hash tasks are
+    # always awaited (or cancelled) even if a database step fails.
+    async with asyncio.TaskGroup() as tg:
+        hash_tasks = [
+            tg.create_task(asyncio.to_thread(get_password_hash, user_data["password"]))
+            for user_data in test_users
         ]
 
-        print("🌱 Seeding test users...")
-
-        for user_data in test_users:
-            try:
-                user = await auth_service.create_user(**user_data)
-                print(f"✅ Created user: {user.email} ({user.role.value})")
-            except Exception as e:
-                print(f"⚠️  User {user_data['email']} already exists or error: {e}")
-
-        print("\n✨ Seeding complete!")
-        print("\nTest Users:")
-        print("-" * 60)
-        for user_data in test_users:
-            print(
-                f"Role: {user_data['role'].value:20} | Email: {user_data['email']:30} | Password: {user_data['password']}"
+        async with async_session() as session:
+            hospital_result = await session.execute(select(Hospital).limit(1))
+            hospital = hospital_result.scalar_one_or_none()
+
+            if not hospital:
+                logger.error("❌ No hospitals found! Run migrations first.")
+                return
+
+            rows = [
+                {
+                    "email": user_data["email"],
+                    "hashed_password": await hash_task,
+                    "full_name": user_data["full_name"],
+                    "role": user_data["role"],
+                    "hospital_id": hospital.id,
+                    "department": user_data["department"],
+                }
+                for user_data, hash_task in zip(test_users, hash_tasks)
+            ]
+
+            # One multi-row INSERT; users whose email already exists are skipped
+            result = await session.execute(
+                insert(User).on_conflict_do_nothing().returning(User.email), rows
             )
-        print("-" * 60)
+            created = set(result.scalars())
+            await session.commit()
+
+    for user_data in test_users:
+        if user_data["email"] not in created:
+            logger.warning("⚠️  User %s already exists", user_data["email"])
+
+    # Emit the whole report with a single write
+    rule = "-" * 60
+    created_lines = [
+        f"✅ Created user: {user_data['email']} ({user_data['role'].value})"
+        for user_data in test_users
+        if user_data["email"] in created
+    ]
+    user_lines = [
+        f"Role: {user_data['role'].value:20} | Email: {user_data['email']:30} | Password: {user_data['password']}"
+        for user_data in test_users
+    ]
+    logger.info(
+        "\n".join(
+            [
+                *created_lines,
+                "\n✨ Seeding complete!",
+                "\nTest Users:",
+                rule,
+                *user_lines,
+                rule,
+            ]
+        )
+    )
+
 
-    await engine.dispose()
+async def main():
+    """Seed users, then dispose the engine on the same event loop."""
+    try:
+        await seed_test_users()
+    finally:
+        await get_engine().dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_test_users())
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
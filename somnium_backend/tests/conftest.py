@@ -0,0 +1,13 @@
+"""Shared pytest configuration"""
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+
+if uvloop is not None:
+
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop's lower-overhead event loop"""
+        return {"uvloop": uvloop.new_event_loop}
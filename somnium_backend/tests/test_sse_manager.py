@@ -1,23 +1,27 @@
 """Test SSE Event Manager"""
 
 import asyncio
+from unittest.mock import patch
+
+import orjson
 import pytest
-from app.core.events import SSEEventManager
+from app.core import events
+from app.core.events import SSEEventManager, SSESink
 
 
 @pytest.mark.asyncio
 async def test_sse_subscribe_unsubscribe():
     """Test subscribing and unsubscribing to events"""
     manager = SSEEventManager()
-    queue = asyncio.Queue()
+    sink = SSESink(raw=True)
     patient_id = "test-patient-123"
 
     # Subscribe
-    await manager.subscribe(patient_id, queue)
+    await manager.subscribe(patient_id, sink)
     assert manager.get_subscriber_count(patient_id) == 1
 
     # Unsubscribe
-    await manager.unsubscribe(patient_id, queue)
+    await manager.unsubscribe(patient_id, sink)
     assert manager.get_subscriber_count(patient_id) == 0
 
 
@@ -25,53 +29,215 @@ async def test_sse_subscribe_unsubscribe():
 async def test_sse_publish_event():
     """Test publishing events to subscribers"""
     manager = SSEEventManager()
-    queue = asyncio.Queue()
+    sink = SSESink(raw=True)
     patient_id = "test-patient-456"
 
-    await manager.subscribe(patient_id, queue)
+    await manager.subscribe(patient_id, sink)
 
     # Publish event
     test_data = {"vitals": {"heart_rate": 80, "bp": "120/80"}}
     await manager.publish(patient_id, "vitals_update", test_data)
 
     # Check event received
-    event = await asyncio.wait_for(queue.get(), timeout=1.0)
+    await asyncio.wait_for(sink.ready.wait(), timeout=1.0)
+    event = sink.events.popleft()
     assert event["event"] == "vitals_update"
     assert event["data"] == test_data
     assert event["patient_id"] == patient_id
 
-    await manager.unsubscribe(patient_id, queue)
+    await manager.unsubscribe(patient_id, sink)
 
 
 @pytest.mark.asyncio
 async def test_sse_multiple_subscribers():
     """Test multiple subscribers to same patient"""
     manager = SSEEventManager()
-    queue1 = asyncio.Queue()
-    queue2 = asyncio.Queue()
+    sink1 = SSESink(raw=True)
+    sink2 = SSESink(raw=True)
     patient_id = "test-patient-789"
 
-    await manager.subscribe(patient_id, queue1)
-    await manager.subscribe(patient_id, queue2)
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(manager.subscribe(patient_id, sink1))
+        tg.create_task(manager.subscribe(patient_id, sink2))
     assert manager.get_subscriber_count(patient_id) == 2
 
     # Publish event
     test_data = {"alert": "high_lactate"}
     await manager.publish(patient_id, "alert", test_data)
 
-    # Both queues should receive event
-    event1 = await asyncio.wait_for(queue1.get(), timeout=1.0)
-    event2 = await asyncio.wait_for(queue2.get(), timeout=1.0)
+    # Both sinks should receive event; wait on them concurrently so any
+    # serialization between subscribers inside publish shows up here
+    [event1], [event2] = await asyncio.gather(
+        asyncio.wait_for(sink1.drain(), timeout=1.0),
+        asyncio.wait_for(sink2.drain(), timeout=1.0),
+    )
 
     assert event1["event"] == "alert"
     assert event2["event"] == "alert"
+    # The envelope is built once per publish and shared across subscribers
+    assert event1 is event2
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(manager.unsubscribe(patient_id, sink1))
+        tg.create_task(manager.unsubscribe(patient_id, sink2))
+    assert manager.get_subscriber_count(patient_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_sse_full_sink_drops_oldest_event():
+    """Test a full subscriber sink drops its oldest event instead of blocking"""
+    manager = SSEEventManager()
+    slow_sink = SSESink(maxlen=2, raw=True)
+    fast_sink = SSESink(raw=True)
+    patient_id = "test-patient-321"
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(manager.subscribe(patient_id, slow_sink))
+        tg.create_task(manager.subscribe(patient_id, fast_sink))
+
+    for seq in range(3):
+        await manager.publish(patient_id, "vitals_update", {"seq": seq})
+
+    # Slow subscriber keeps the newest events and stays subscribed
+    assert manager.get_subscriber_count(patient_id) == 2
+    slow_events = await asyncio.wait_for(slow_sink.drain(), timeout=1.0)
+    assert [event["data"]["seq"] for event in slow_events] == [1, 2]
+    assert len(fast_sink.events) == 3
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(manager.unsubscribe(patient_id, slow_sink))
+        tg.create_task(manager.unsubscribe(patient_id, fast_sink))
+
+
+@pytest.mark.asyncio
+async def test_sse_publish_framed_bytes():
+    """Test framed subscribers share one pre-serialized SSE frame"""
+    manager = SSEEventManager()
+    sink1 = SSESink()
+    sink2 = SSESink()
+    patient_id = "test-patient-654"
+
+    await manager.subscribe(patient_id, sink1)
+    await manager.subscribe(patient_id, sink2)
+
+    test_data = {"vitals": {"heart_rate": 80}}
+    await manager.publish(patient_id, "vitals_update", test_data)
+
+    [frame1] = await asyncio.wait_for(sink1.drain(), timeout=1.0)
+    [frame2] = await asyncio.wait_for(sink2.drain(), timeout=1.0)
+    assert frame1 is frame2
+
+    prefix = b"event: vitals_update\ndata: "
+    assert frame1.startswith(prefix)
+    assert frame1.endswith(b"\n\n")
+    assert orjson.loads(frame1[len(prefix) : -2]) == {
+        "event": "vitals_update",
+        "data": test_data,
+        "patient_id": patient_id,
+    }
+
+    await manager.unsubscribe(patient_id, sink1)
+    await manager.unsubscribe(patient_id, sink2)
 
-    await manager.unsubscribe(patient_id, queue1)
-    await manager.unsubscribe(patient_id, queue2)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n_subs", [2, 64, 1024])
+async def test_sse_publish_scales(n_subs):
+    """Test publish encodes one frame and fans it out to every subscriber"""
+    manager = SSEEventManager()
+    sinks = [SSESink() for _ in range(n_subs)]
+    patient_id = "test-patient-987"
+
+    await asyncio.gather(*(manager.subscribe(patient_id, sink) for sink in sinks))
+    assert manager.get_subscriber_count(patient_id) == n_subs
+
+    with patch.object(
+        events, "_encode_frame", wraps=events._encode_frame
+    ) as encode_frame:
+        await manager.publish(patient_id, "vitals_update", {"heart_rate": 80})
+
+    # Serialization cost must not grow with the number of subscribers
+    assert encode_frame.call_count == 1
+
+    received = await asyncio.gather(
+        *(asyncio.wait_for(sink.drain(), timeout=1.0) for sink in sinks)
+    )
+    # Every sink gets exactly the one shared frame
+    assert all(len(frames) == 1 for frames in received)
+    assert len({id(frames[0]) for frames in received}) == 1
+
+    await asyncio.gather(*(manager.unsubscribe(patient_id, sink) for sink in sinks))
+    assert manager.get_subscriber_count(patient_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_sse_sink_timed_out_drains_leave_no_waiters():
+    """Test polling an empty sink with timeouts does not accumulate waiters"""
+    manager = SSEEventManager()
+    sink = SSESink(raw=True)
+    patient_id = "test-patient-147"
+
+    await manager.subscribe(patient_id, sink)
+
+    for _ in range(100):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(sink.drain(), timeout=0.0001)
+    assert not sink.ready._waiters
+
+    # The sink still delivers after the timed-out polls
+    await manager.publish(patient_id, "alert", {"alert": "low_flow"})
+    [event] = await asyncio.wait_for(sink.drain(), timeout=1.0)
+    assert event["data"] == {"alert": "low_flow"}
+
+    await manager.unsubscribe(patient_id, sink)
+
+
+@pytest.mark.asyncio
+async def test_sse_publish_batch():
+    """Test a batch reaches each subscriber in order with a single wake-up"""
+    manager = SSEEventManager()
+    raw_sink = SSESink(raw=True)
+    framed_sink = SSESink()
+    patient_id = "test-patient-258"
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(manager.subscribe(patient_id, raw_sink))
+        tg.create_task(manager.subscribe(patient_id, framed_sink))
+
+    await manager.publish_batch(
+        patient_id,
+        [
+            ("vitals_snapshot", {"heart_rate": 80}),
+            ("vitals_update", {"heart_rate": 82}),
+        ],
+    )
+
+    raw_events, frames = await asyncio.gather(
+        asyncio.wait_for(raw_sink.drain(), timeout=1.0),
+        asyncio.wait_for(framed_sink.drain(), timeout=1.0),
+    )
+    assert [event["event"] for event in raw_events] == [
+        "vitals_snapshot",
+        "vitals_update",
+    ]
+    assert [frame.split(b"\n", 1)[0] for frame in frames] == [
+        b"event: vitals_snapshot",
+        b"event: vitals_update",
+    ]
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(manager.unsubscribe(patient_id, raw_sink))
+        tg.create_task(manager.unsubscribe(patient_id, framed_sink))
 
 
 if __name__ == "__main__":
     asyncio.run(test_sse_subscribe_unsubscribe())
     asyncio.run(test_sse_publish_event())
     asyncio.run(test_sse_multiple_subscribers())
+    asyncio.run(test_sse_full_sink_drops_oldest_event())
+    asyncio.run(test_sse_publish_framed_bytes())
+    asyncio.run(test_sse_sink_timed_out_drains_leave_no_waiters())
+    asyncio.run(test_sse_publish_batch())
+    for n_subs in (2, 64, 1024):
+        asyncio.run(test_sse_publish_scales(n_subs))
     print("✅ All SSE Event Manager tests passed!")